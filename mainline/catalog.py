@@ -1,6 +1,5 @@
 import inspect
 import typing
-import six
 import abc
 
 from mainline.utils import ProxyMutableMapping
@@ -23,7 +22,12 @@ class ProviderMapping(ProxyMutableMapping):
         else:
             self._providers = self._mapping_factory()
         super(ProviderMapping, self).__init__(self._providers)
-        self.update(dict(*args, **kwargs))
+        cls = type(self)
+        if cls.get is ProviderMapping.get and cls.__getitem__ is ProviderMapping.__getitem__:
+            # Looked up on every resolution, so have reads go straight to the dict's C implementation
+            self.get = self._providers.get
+        if args or kwargs:
+            self.update(dict(*args, **kwargs))
 
     def update(self, arg, allow_overwrite=False):
         """
@@ -70,11 +74,10 @@ class CatalogMeta(abc.ABCMeta):
         else:
             cls._providers = mcs._provider_mapping_factory()
 
-        cls._providers.update({k: v for k, v in six.iteritems(attributes) if isinstance(v, IProvider)})
+        cls._providers.update({k: v for k, v in attributes.items() if isinstance(v, IProvider)})
 
         return cls
 
 
-@six.add_metaclass(CatalogMeta)
-class Catalog(ICatalog, ProviderMapping):
+class Catalog(ICatalog, ProviderMapping, metaclass=CatalogMeta):
     pass
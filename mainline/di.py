@@ -1,7 +1,5 @@
-from __future__ import absolute_import, division, print_function, unicode_literals
-
+import sys
 import typing
-import functools
 
 from mainline.catalog import ICatalog, Catalog
 from mainline.exceptions import UnresolvableError
@@ -29,6 +27,11 @@ class Di(ICatalog):
     def __init__(self, providers_factory=Catalog, dependencies_factory=dict):
         self._providers = providers_factory()
         self._dependencies = dependencies_factory()
+
+        # Bind these once, as they're hit for every key resolved
+        self._get_provider = self._providers.get
+        self._get_deps = self._dependencies.get
+
         super(Di, self).__init__()
 
     @property
@@ -70,7 +73,11 @@ class Di(ICatalog):
         :return: Dependencies
         :rtype: set
         '''
-        return self._dependencies.get(obj, set())
+        deps = self._get_deps(obj)
+        if deps is None:
+            # Only allocate the empty default when it's actually needed
+            return set()
+        return deps
 
     def get_missing_deps(self, obj):
         '''
@@ -82,14 +89,30 @@ class Di(ICatalog):
         :return: Missing dependencies
         :rtype: list
         '''
-        deps = self.get_deps(obj)
-        ret = []
-        for key in deps:
-            provider = self._providers.get(key)
-            if provider and provider.providable:
-                continue
-            ret.append(key)
-        return ret
+        deps = self._get_deps(obj)
+        if not deps:
+            # Most keys have no dependencies at all; don't bother allocating for them.
+            return []
+
+        # Fetch the providers with map so the lookups stay in C, leaving only the providable check per key
+        return [
+            key for key, provider in zip(deps, map(self._get_provider, deps))
+            if not (provider and provider.providable)
+        ]
+
+    def _resolve_one(self, key):
+        provider = self._get_provider(key)
+
+        # Most keys have no dependencies registered, in which case there's nothing that can be missing
+        if self._get_deps(key):
+            missing = self.get_missing_deps(key)
+            if missing:
+                raise UnresolvableError("Missing dependencies for %s: %s" % (key, missing))
+
+        if not provider:
+            raise UnresolvableError("Provider does not exist for %s" % key)
+
+        return provider()
 
     def iresolve(self, *keys):
         '''
@@ -100,16 +123,9 @@ class Di(ICatalog):
         :return: Iterator of resolved instances
         :rtype: generator
         '''
+        resolve_one = self._resolve_one
         for key in keys:
-            missing = self.get_missing_deps(key)
-            if missing:
-                raise UnresolvableError("Missing dependencies for %s: %s" % (key, missing))
-
-            provider = self._providers.get(key)
-            if not provider:
-                raise UnresolvableError("Provider does not exist for %s" % key)
-
-            yield provider()
+            yield resolve_one(key)
 
     def resolve(self, *keys):
         '''
@@ -122,10 +138,10 @@ class Di(ICatalog):
         :return: Resolved instance(s); if only one key given, otherwise list of them.
         :rtype: object or list
         '''
-        instances = list(self.iresolve(*keys))
         if len(keys) == 1:
-            return instances[0]
-        return instances
+            # Don't bother with a generator and list just to unpack them again
+            return self._resolve_one(keys[0])
+        return list(map(self._resolve_one, keys))
 
     def resolve_deps(self, obj):
         '''
@@ -136,8 +152,11 @@ class Di(ICatalog):
         :return: Resolved dependencies
         :rtype: list
         '''
-        deps = self.get_deps(obj)
-        return list(self.iresolve(*deps))
+        deps = self._get_deps(obj)
+        if not deps:
+            return []
+        # We already have the keys, so don't unpack them into iresolve only to pull them back out of a generator
+        return list(map(self._resolve_one, deps))
 
     def register_factory(self, key, factory=_sentinel, scope=NoneScope, allow_overwrite=False):
         '''
@@ -154,7 +173,14 @@ class Di(ICatalog):
         :rtype: callable or None
         '''
         if factory is _sentinel:
-            return functools.partial(self.register_factory, key, scope=scope, allow_overwrite=allow_overwrite)
+            def decorator(wrapped):
+                return self.register_factory(key, wrapped, scope=scope, allow_overwrite=allow_overwrite)
+
+            return decorator
+        if type(key) is str:
+            # Keys built at runtime then share identity with the literals they're usually resolved by, so lookups
+            # match on the pointer check rather than a full string compare.
+            key = sys.intern(key)
         if not allow_overwrite and key in self._providers:
             raise KeyError("Key %s already exists" % key)
         provider = self.provider(factory, scope)
@@ -190,12 +216,14 @@ class Di(ICatalog):
         :return: decorator
         :rtype: decorator
         '''
+        dependencies = self._dependencies
 
         def decorator(wrapped):
             if keys:
-                if wrapped not in self._dependencies:
-                    self._dependencies[wrapped] = set()
-                self._dependencies[wrapped].update(keys)
+                deps = dependencies.get(wrapped)
+                if deps is None:
+                    deps = dependencies[wrapped] = set()
+                deps.update(keys)
             return wrapped
 
         return decorator
@@ -1,16 +1,50 @@
 import functools
-
-import six
-import wrapt
+import weakref
 
 from mainline.exceptions import DiError
+from mainline.scope import GlobalScope
 from mainline.utils import OBJECT_INIT, classproperty
 
-try:
-    from inspect import FullArgSpec as ArgSpec
-    from inspect import getfullargspec as getargspec
-except ImportError:
-    from inspect import ArgSpec, getargspec
+from inspect import FullArgSpec as ArgSpec
+from inspect import getfullargspec as getargspec
+from inspect import signature
+
+_sentinel = object()
+
+_argspec_cache = weakref.WeakKeyDictionary()
+_signature_cache = weakref.WeakKeyDictionary()
+
+
+def _get_cached(cache, factory, wrapped):
+    """
+    Returns factory(wrapped), caching it in cache for the lifetime of wrapped.
+    """
+    try:
+        return cache[wrapped]
+    except (KeyError, TypeError):
+        pass
+
+    value = factory(wrapped)
+    try:
+        cache[wrapped] = value
+    except TypeError:
+        # Can't be weakly referenced, so just don't cache it
+        pass
+    return value
+
+
+def _get_argspec(wrapped):
+    """
+    Returns the argspec of wrapped, caching it for the lifetime of wrapped.
+    """
+    return _get_cached(_argspec_cache, getargspec, wrapped)
+
+
+def _get_signature(wrapped):
+    """
+    Returns the signature of wrapped, caching it for the lifetime of wrapped.
+    """
+    return _get_cached(_signature_cache, signature, wrapped)
 
 
 class Injector(object):
@@ -24,7 +58,7 @@ class Injector(object):
     def __call__(self, wrapped):
         raise NotImplementedError
 
-    def decorate(self, wrapped):
+    def decorate(self, wrapped, method=False):
         raise NotImplementedError
 
 
@@ -39,18 +73,21 @@ class CallableInjector(Injector):
         self.kwargs = kwargs
 
     def __call__(self, wrapped):
-        if isinstance(wrapped, six.class_types):
+        if isinstance(wrapped, type):
             cls = wrapped
-            try:
-                cls_init = six.get_unbound_function(cls.__init__)
-                assert cls_init is not OBJECT_INIT
-            except (AttributeError, AssertionError):
+            cls_init = cls.__init__
+            # Not an assert, as those go away under -O
+            if cls_init is OBJECT_INIT:
                 raise DiError('Class %s has no __init__ to inject' % cls)
-            cls.__init__ = self(cls_init)
+            cls.__init__ = self._inject(cls_init, method=True)
             return cls
 
-        if not any([self.args, self.kwargs]):
-            self.injectables = self.di.get_deps(wrapped)
+        return self._inject(wrapped)
+
+    def _inject(self, wrapped, method=False):
+        if not (self.args or self.kwargs):
+            # Snapshot, so later dependency changes on wrapped don't change what we were decorated with
+            self.injectables = tuple(self.di.get_deps(wrapped))
         else:
             self.injectables = []
             if self.args:
@@ -59,7 +96,7 @@ class CallableInjector(Injector):
                 self.injectables.extend(self.kwargs.values())
             self.di.depends_on(*self.injectables)(wrapped)
 
-        return self.decorate(wrapped)
+        return self.decorate(wrapped, method=method)
 
 
 class SpecInjector(CallableInjector):
@@ -67,9 +104,52 @@ class SpecInjector(CallableInjector):
     Injects requested deps into a callable's args and kwargs at execution time, taking callable's argspec into account.
     """
 
-    def decorate(self, wrapped):
+    def decorate(self, wrapped, method=False):
+        # What gets injected where is fixed at this point, so only resolution is left for call time.
+        # Straight to the per key resolution; map over it builds the injected values without a generator frame or
+        # varargs packing on every call.
+        resolve_one = self.di._resolve_one
+        arg_keys = tuple(self.args)
+        kwarg_items = tuple(self.kwargs.items())
+        kwarg_names = tuple(k for k, _ in kwarg_items)
+        kwarg_keys = tuple(v for _, v in kwarg_items)
+
+        if method or not arg_keys:
+            # Keyword injection leaves both the signature and positional binding untouched, and when we know we're
+            # wrapping a method (ie a class's __init__) positional args simply go after the instance. Either way a
+            # plain wrapper does the job without going through wrapt's proxy on every call.
+            @functools.wraps(wrapped)
+            def wrapper(*args, **kwargs):
+                if arg_keys:
+                    args = args[:1] + tuple(map(resolve_one, arg_keys)) + args[1:]
+
+                if kwargs:
+                    injected_kwargs = {
+                        k: resolve_one(v)
+                        for k, v in kwarg_items if k not in kwargs  # No need to resolve if we're overridden
+                    }
+                    injected_kwargs.update(kwargs)
+                else:
+                    # Nothing overridden, so resolve them all in one pass
+                    injected_kwargs = dict(zip(kwarg_names, map(resolve_one, kwarg_keys)))
+
+                return wrapped(*args, **injected_kwargs)
+
+            # Keep getfullargspec honest, as it does not follow __wrapped__
+            sig = _get_signature(wrapped)
+            if arg_keys:
+                params = list(sig.parameters.values())
+                sig = sig.replace(parameters=params[:1] + params[1 + len(arg_keys):])
+            wrapper.__signature__ = sig
+
+            return wrapper
+
+        # Positional injection needs to know about the instance a method is bound to, as well as an adapted argspec,
+        # which is what wrapt gives us. It's only needed here, so don't make importing mainline pay for it.
+        import wrapt
+
         # Remove the number of args from the wrapped function's argspec
-        spec = getargspec(wrapped)
+        spec = _get_argspec(wrapped)
         new_args = spec.args[len(self.args):]
 
         # Update argspec
@@ -77,28 +157,29 @@ class SpecInjector(CallableInjector):
 
         @wrapt.decorator(adapter=spec)
         def decorator(wrapped, instance, args, kwargs):
-            injected_args = list(self.di.iresolve(*self.args))
+            # A tuple is handed straight through by the call below, whereas a list would be copied into one.
+            injected_args = tuple(map(resolve_one, arg_keys))
 
             if args:
-                injected_args.extend(args)
-
-            injected_kwargs = {
-                k: self.di.resolve(v)
-                for k, v in six.iteritems(self.kwargs) if k not in kwargs  # No need to resolve if we're overridden
-            }
-
-            if kwargs:
+                injected_args += args
+
+            if not kwarg_items:
+                injected_kwargs = kwargs
+            elif kwargs:
+                injected_kwargs = {
+                    k: resolve_one(v)
+                    for k, v in kwarg_items if k not in kwargs  # No need to resolve if we're overridden
+                }
                 injected_kwargs.update(kwargs)
+            else:
+                # Nothing overridden, so resolve them all in one pass
+                injected_kwargs = dict(zip(kwarg_names, map(resolve_one, kwarg_keys)))
 
             return wrapped(*injected_args, **injected_kwargs)
 
         return decorator(wrapped)  # pylint: disable=E1120
 
 
-class NotFound(Exception):
-    pass
-
-
 class AutoSpecInjector(CallableInjector):
     """
     Injects inferred deps into a callable's args and kwargs at execution time.
@@ -106,46 +187,52 @@ class AutoSpecInjector(CallableInjector):
     Deps are inferred based on the callable's argspec (ie the names of the arguments), and/or function annotations.
     """
 
-    def decorate(self, wrapped):
-        spec = getargspec(wrapped)
+    def decorate(self, wrapped, method=False):
+        spec = _get_argspec(wrapped)
+        resolve_one = self.di._resolve_one
+        # TODO Might want auto to not be restrictable, hmm.
+        # injectables = set(self.injectables or self.di.providers)
+        injectables = self.di.providers
+
+        # Unpack the argspec namedtuple once rather than going through its property descriptors on every call.
+        spec_args = spec.args
+        spec_kwonlyargs = spec.kwonlyargs
+        spec_annotations = spec.annotations
+
+        # Freeze the requested renames up front; the wrapper runs many times and must not consume them.
+        overrides = dict(self.kwargs)
+        spec_names = set(spec_args).union(spec_kwonlyargs)
+        # Renames that don't target an argument in the argspec are simply passed along as keyword arguments
+        extra_kwarg_items = tuple((k, v) for k, v in overrides.items() if k not in spec_names)
+
+        def _find_injectable(arg):
+            # Allow override of injected name via kwarg syntax injected_as_name=injectable_name
+            arg = overrides.get(arg, arg)
+
+            # If exact match, return that; it gets priority over annotations
+            if arg in injectables:
+                return resolve_one(arg)
+
+            # Argument annotations: def test(blah: 'an_annotation')
+            if arg in spec_annotations:
+                # Allow override of injected name via annotation
+                # Note: this should only be tried after the exact match
+                arg_annotation = spec_annotations[arg]
+                if arg_annotation in injectables:
+                    return resolve_one(arg_annotation)
+
+            # Nope, can't be found. A sentinel rather than raising, as this is the norm for non-injected args.
+            return _sentinel
 
         def decorator(*args, **kwargs):
-            # TODO Might want auto to not be restrictable, hmm.
-            # injectables = set(self.injectables or self.di.providers)
-            injectables = self.di.providers
-
-            # These are py3 only, so use getattr with a default
-            spec_kwonlyargs = getattr(spec, 'kwonlyargs', [])
-            spec_annotations = getattr(spec, 'annotations', {})
-
-            def _find_injectable(arg):
-                # Allow override of injected name via kwarg syntax injected_as_name=injectable_name
-                arg = self.kwargs.pop(arg, arg)
-
-                # If exact match, return that; it gets priority over annotations
-                if arg in injectables:
-                    return self.di.resolve(arg)
-
-                # Py3 argument annotations: def test(blah: 'an_annotation')
-                if arg in spec_annotations:
-                    # Allow override of injected name via annotation (py3)
-                    # Note: this should only be tried after the exact match
-                    arg_annotation = spec_annotations[arg]
-                    if arg_annotation in injectables:
-                        return self.di.resolve(arg_annotation)
-
-                # Nope, can't be found
-                raise NotFound(arg)
-
             injected_args = []
             injected_kwargs = {}
 
             # Positional args
             args_cur_index = 0
-            for arg in spec.args:
-                try:
-                    obj = _find_injectable(arg)
-                except NotFound:
+            for arg in spec_args:
+                obj = _find_injectable(arg)
+                if obj is _sentinel:
                     try:
                         obj = args[args_cur_index]
                         args_cur_index += 1
@@ -160,11 +247,10 @@ class AutoSpecInjector(CallableInjector):
             if remaining_args:
                 injected_args.extend(remaining_args)
 
-            # Py3 keyword only args: def test(*, arg1)
+            # Keyword only args: def test(*, arg1)
             for arg in spec_kwonlyargs:
-                try:
-                    obj = _find_injectable(arg)
-                except NotFound:
+                obj = _find_injectable(arg)
+                if obj is _sentinel:
                     try:
                         obj = kwargs.pop(arg)
                     except KeyError:
@@ -175,8 +261,8 @@ class AutoSpecInjector(CallableInjector):
 
             injected_kwargs.update(
                 {
-                    k: self.di.resolve(v)
-                    for k, v in six.iteritems(self.kwargs) if k not in kwargs  # No need to resolve if we're overridden
+                    k: resolve_one(v)
+                    for k, v in extra_kwarg_items if k not in kwargs  # No need to resolve if we're overridden
                 }
             )
 
@@ -199,12 +285,11 @@ class ClassPropertyInjector(Injector):
         self.name = name
         self.replace_on_access = replace_on_access
 
-    def _wrap_classproperty(self, cls, key, name, replace_on_access, owner=None):
-        # owner is set to the instance if applicable
-        val = self.di.resolve(key)
-        if replace_on_access:
-            setattr(cls, name, val)
-        return val
+    def _is_built_singleton(self):
+        provider = self.di.providers.get(self.key)
+        if not isinstance(getattr(provider, 'scope', None), GlobalScope):
+            return False
+        return provider.has_instance() and not self.di.get_missing_deps(self.key)
 
     def __call__(self, klass):
         name = self.name or self.key
@@ -212,10 +297,24 @@ class ClassPropertyInjector(Injector):
         # Register as dependency for klass
         self.di.depends_on(self.key)(klass)
 
-        # Add in arguments
-        partial = functools.partial(self._wrap_classproperty, klass, self.key, name, self.replace_on_access)
+        if self.replace_on_access and self._is_built_singleton():
+            # We'd replace ourselves with this exact value on first access anyway, so skip the descriptor entirely.
+            # Nothing gets constructed here; we only take this path when the instance already exists.
+            setattr(klass, name, self.di.resolve(self.key))
+            return klass
+
+        resolve_one = self.di._resolve_one
+        key = self.key
+        replace_on_access = self.replace_on_access
+
+        def getter(owner):
+            val = resolve_one(key)
+            if replace_on_access:
+                setattr(klass, name, val)
+            return val
+
         # Create classproperty from it
-        clsprop = classproperty(partial)
+        clsprop = classproperty(getter)
 
         # Attach descriptor to object
         setattr(klass, name, clsprop)
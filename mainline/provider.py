@@ -1,11 +1,11 @@
-import functools
-
 from mainline.exceptions import UnprovidableError
 from mainline.scope import ScopeRegistry, NoneScope
 _sentinel = object()
 
 
 class IProvider(object):
+    # Providers can still be weakly referenced; they just don't get a __dict__
+    __slots__ = ('__weakref__',)
 
     def __init__(self):
         pass
@@ -28,6 +28,7 @@ class IProvider(object):
 
 
 class IFactoryProvider(IProvider):
+    __slots__ = ('factory',)
 
     def __init__(self, factory=None):
         self.set_factory(factory)
@@ -48,10 +49,14 @@ class IFactoryProvider(IProvider):
 
     @property
     def providable(self):
-        return self.has_instance() or self.has_factory()
+        # Having a factory is both the common case and far cheaper to check than asking the scope
+        return self.has_factory() or self.has_instance()
 
 
 class Provider(IFactoryProvider):
+    # There's one of these per registered key, and these attributes are hit on every resolution
+    __slots__ = ('key', '_scope', '_provide')
+
     scopes = ScopeRegistry()
 
     def __init__(self, factory, scope=NoneScope, key=''):
@@ -59,21 +64,63 @@ class Provider(IFactoryProvider):
         self.scope = self.scopes.resolve(scope)
         super(Provider, self).__init__(factory)
 
+    @property
+    def scope(self):
+        return self._scope
+
+    @scope.setter
+    def scope(self, scope):
+        self._scope = scope
+
+        # The resolution path only depends on the scope and our class, so pick it here rather than on every call.
+        # Kept unbound, as a bound method would make every provider a reference cycle.
+        provide = type(self).provide
+        if provide is Provider.provide:
+            provide = self._select_provide()
+        self._provide = provide
+
+    def _select_provide(self):
+        cls = type(self)
+        if cls.has_instance is not Provider.has_instance or cls.set_instance is not Provider.set_instance:
+            # Storage is customized, so go through the hooks
+            return Provider._provide_via_hooks
+        if isinstance(self._scope, NoneScope):
+            # Nothing is ever stored in a NoneScope; skip the instance lookup and store entirely.
+            return IFactoryProvider.provide
+        return Provider._provide_via_scope
+
     def __repr__(self):
         return '<%s factory=%s scope=%s>' % (self.__class__.__name__, self.factory, self.scope)
 
+    def __call__(self, *args, **kwargs):
+        return self._provide(self, *args, **kwargs)
+
     def provide(self, *args, **kwargs):
+        return self._select_provide()(self, *args, **kwargs)
+
+    def _provide_via_hooks(self, *args, **kwargs):
         if self.has_instance():
-            return self.scope[self.key]
+            return self._scope[self.key]
         instance = super(Provider, self).provide(*args, **kwargs)
         self.set_instance(instance)
         return instance
 
+    def _provide_via_scope(self, *args, **kwargs):
+        scope = self._scope
+        key = self.key
+        # One lookup rather than a membership test followed by a fetch
+        instance = scope.get(key, _sentinel)
+        if instance is not _sentinel:
+            return instance
+        instance = super(Provider, self).provide(*args, **kwargs)
+        # Should another thread have beaten us to it, go with theirs so everyone ends up with the same instance
+        return scope.setdefault(key, instance)
+
     def has_instance(self):
-        return self.key in self.scope
+        return self.key in self._scope
 
     def set_instance(self, instance):
-        self.scope[self.key] = instance
+        self._scope[self.key] = instance
 
 
 def provider_factory(factory=_sentinel, scope=NoneScope):
@@ -87,6 +134,9 @@ def provider_factory(factory=_sentinel, scope=NoneScope):
     :rtype: decorator
     '''
     if factory is _sentinel:
-        return functools.partial(provider_factory, scope=scope)
+        def decorator(wrapped):
+            return provider_factory(wrapped, scope=scope)
+
+        return decorator
     provider = Provider(factory, scope)
     return provider
@@ -1,16 +1,24 @@
 import os
-import typing
 import threading
 import collections
 
+from collections.abc import MutableMapping
+
 from mainline.utils import ProxyMutableMapping
 
 _sentinel = object()
 
 
+def _identity(key):
+    return key
+
+
 class IScope(ProxyMutableMapping):
     register = False
     name = None
+    # If True, the registry hands out a single instance of this scope rather than one per provider. Only safe for
+    # scopes that hold no state, so it's not inherited; each class has to set it itself.
+    shared = False
 
     instances = None
     instances_factory = dict
@@ -19,7 +27,12 @@ class IScope(ProxyMutableMapping):
         if self.instances is None:
             self.instances = self.instances_factory()
         super(IScope, self).__init__(self.instances)
-        self.update(dict(*args, **kwargs))
+        if type(self).__key_transform__ is IScope.__key_transform__ and not isinstance(self.instances, IScope):
+            # Without a transform there's nothing to do to keys, so don't pay for wrapping them on every access. Not
+            # when proxying another scope though, as the wrapping is what tells it the key has already been handled.
+            self._key_factory = _identity
+        if args or kwargs:
+            self.update(dict(*args, **kwargs))
 
     def __str__(self):
         return self.name
@@ -28,10 +41,12 @@ class IScope(ProxyMutableMapping):
         return key
 
     class _key(str):
-        pass
+        # These are created on every scope access, so don't give each one a __dict__
+        __slots__ = ()
 
     def _key_factory(self, key):
-        if not isinstance(key, self._key):
+        # _key is never subclassed, so an exact type check does and skips isinstance's subclass machinery
+        if type(key) is not self._key:
             key = self.__key_transform__(key)
             key = self._key(key)
         return key
@@ -56,12 +71,31 @@ class IScope(ProxyMutableMapping):
 class NoneScope(IScope):
     register = True
     name = 'none'
+    shared = True
 
     def __setitem__(self, key, value):
         return
 
 
-class GlobalScope(IScope):
+class DirectScope(IScope):
+    """
+    Unless a subclass customizes key handling or item access, skips the key wrapping and the proxy for provider lookups
+    and goes straight to the instances dict.
+    """
+
+    # Overriding any of these means the subclass wants to see provider lookups and stores
+    _direct_overridables = ('__key_transform__', '__contains__', '__getitem__', '__setitem__', 'get', 'setdefault')
+
+    def __init__(self, *args, **kwargs):
+        super(DirectScope, self).__init__(*args, **kwargs)
+        cls = type(self)
+        if all(getattr(cls, name) is getattr(IScope, name) for name in self._direct_overridables):
+            # These are what providers use, so have them go straight to the dict's C implementations
+            self.get = self.instances.get
+            self.setdefault = self.instances.setdefault
+
+
+class GlobalScope(DirectScope):
     register = True
     name = 'global'
 
@@ -75,22 +109,31 @@ class ProcessScope(IScope):
     register = True
     name = 'process'
 
+    _key_prefix = None
+
+    @classmethod
+    def _refresh_key_prefix(cls):
+        cls._key_prefix = '%s_' % os.getpid()
+
     def __key_transform__(self, key):
-        return '%s_%s' % (os.getpid(), key)
+        # The prefix is refreshed in the child on fork, so there's no need to ask for the pid on every access
+        return self._key_prefix + str(key)
 
 
-class ThreadScope(IScope):
-    register = True
-    name = 'thread'
+ProcessScope._refresh_key_prefix()
+# Platforms without this can't fork either, so the prefix computed above holds for good
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=ProcessScope._refresh_key_prefix)
 
-    def __init__(self, *args, **kwargs):
-        self._thread_local = threading.local()
-        super(ThreadScope, self).__init__(*args, **kwargs)
 
-    def instances_factory(self):
-        if not hasattr(self._thread_local, 'instances'):
-            self._thread_local.instances = dict()
-        return self._thread_local.instances
+class ThreadScope(DirectScope, threading.local):
+    """
+    Being a thread local, each thread gets its own attributes, and as such its own instances mapping, which is
+    created on first access from that thread by re-running __init__. Unless a subclass overrides item access, that
+    includes the bound get/setdefault, so those go straight to the calling thread's dict.
+    """
+    register = True
+    name = 'thread'
 
 
 class ProxyScope(IScope):
@@ -104,6 +147,8 @@ class NamespacedProxyScope(ProxyScope):
 
     def __init__(self, namespace, scope, *args, **kwargs):
         self.namespace = namespace
+        # Every access prefixes the key with this, so build it once
+        self._key_prefix = '%s__' % namespace
         super(NamespacedProxyScope, self).__init__(scope, *args, **kwargs)
 
     @property
@@ -111,7 +156,7 @@ class NamespacedProxyScope(ProxyScope):
         return self.namespace
 
     def __key_transform__(self, key):
-        return '%s__%s' % (self.namespace, key)
+        return self._key_prefix + str(key)
 
 
 class ContextScope(IScope):
@@ -130,11 +175,12 @@ class ContextScope(IScope):
     def _set_instances(self):
         stack = tuple(self.stack)
 
-        if stack not in self.store:
-            self.store[stack] = self.instances_factory()
+        instances = self.store.get(stack)
+        if instances is None:
+            instances = self.store[stack] = self.instances_factory()
 
-        self.instances = self.store[stack]
-        self._set_mapping(self.instances)
+        self.instances = instances
+        self._set_mapping(instances)
 
     def __enter__(self, context=_sentinel):
         if context is _sentinel:
@@ -148,20 +194,27 @@ class ContextScope(IScope):
         self._set_instances()
 
 
+# Scopes registered by default, in registration order
+SCOPE_CLASSES = [NoneScope, GlobalScope, ProcessScope, ThreadScope, ContextScope]
+
 SCOPE_FACTORIES = {}
 
+# Shared instances of stateless scopes, keyed by factory
+SCOPE_SHARED_INSTANCES = {}
+
 
 class ScopeRegistry(ProxyMutableMapping):
     _factories = SCOPE_FACTORIES
+    _shared_instances = SCOPE_SHARED_INSTANCES
 
     def __init__(self):
         super(ScopeRegistry, self).__init__(self._factories)
         self._build()
 
     def _build(self):
-        classes = IScope.__subclasses__()
-        classes = filter(lambda x: x.register, classes)
-        list(map(self.register_factory, classes))
+        for factory in SCOPE_CLASSES:
+            if factory.register:
+                self.register_factory(factory)
 
     def register_factory(self, factory, name=None):
         if name is None:
@@ -172,6 +225,18 @@ class ScopeRegistry(ProxyMutableMapping):
         self._factories[factory] = factory
 
     def resolve(self, scope_or_scope_factory, instantiate_factory=True):
+        # Names and registered factories are by far the common case, so try those by identity first.
+        try:
+            factory = self._factories.get(scope_or_scope_factory)
+        except TypeError:
+            # Unhashable, so most likely a scope instance
+            factory = None
+
+        if factory is not None:
+            if not instantiate_factory:
+                return factory
+            return self._instantiate(factory)
+
         if self.is_scope_instance(scope_or_scope_factory):
             instance = scope_or_scope_factory
             return instance
@@ -180,17 +245,24 @@ class ScopeRegistry(ProxyMutableMapping):
             factory = scope_or_scope_factory
             if not instantiate_factory:
                 return factory
-            instance = factory()
+            instance = self._instantiate(factory)
             return instance
 
-        elif scope_or_scope_factory in self._factories:
-            factory = self._factories[scope_or_scope_factory]
-            return self.resolve(factory)
-
         else:
             raise KeyError("Scope %s is not known" % scope_or_scope_factory)
 
-    _scope_type = typing.MutableMapping
+    def _instantiate(self, factory):
+        # Looked up on the class itself, so subclasses (which may well hold state) have to opt in on their own
+        if not vars(factory).get('shared', False):
+            return factory()
+
+        instance = self._shared_instances.get(factory)
+        if instance is None:
+            instance = self._shared_instances.setdefault(factory, factory())
+        return instance
+
+    # The ABC itself rather than the typing alias, which only forwards isinstance/issubclass on to it
+    _scope_type = MutableMapping
 
     @classmethod
     def is_scope_factory(cls, obj):
@@ -1,18 +1,7 @@
 import collections
 import typing
-import sys
 
-import six
-
-IS_PYPY = '__pypy__' in sys.builtin_module_names
-
-
-def _get_object_init():
-    if six.PY3 or IS_PYPY:
-        return six.get_unbound_function(object.__init__)
-
-
-OBJECT_INIT = _get_object_init()
+OBJECT_INIT = object.__init__
 
 
 class classproperty(object):
@@ -4,9 +4,15 @@ Note that the docs and the README double as tests themselves.
 
 from unittest import mock
 import pytest
+import functools
 import itertools
+import os
+import threading
+import weakref
+import gc
 
 import mainline
+from mainline.injection import getargspec
 
 
 class TestDi(object):
@@ -141,3 +147,336 @@ class TestDi(object):
             pass
 
         assert di.get_deps(test) == set(deps)
+
+    def test_custom_scope_sees_stores(self, di):
+        stored = []
+
+        class RecordingScope(mainline.scope.IScope):
+            def __setitem__(self, key, value):
+                stored.append(key)
+                super(RecordingScope, self).__setitem__(key, value)
+
+        provider = di.provider(object, scope=RecordingScope)
+        instance = provider()
+        assert provider() is instance
+        assert stored == ['']
+
+    def test_global_scope_subclass_sees_access(self, di):
+        seen = []
+
+        class RecordingScope(mainline.scope.GlobalScope):
+            def __getitem__(self, key):
+                seen.append(('get', key))
+                return super(RecordingScope, self).__getitem__(key)
+
+            def __setitem__(self, key, value):
+                seen.append(('set', key))
+                super(RecordingScope, self).__setitem__(key, value)
+
+        provider = di.provider(object, scope=RecordingScope)
+        instance = provider()
+        assert provider() is instance
+        assert seen.count(('set', '')) == 1
+        assert seen[-1] == ('get', '')
+
+    def test_thread_scope_subclass_sees_stores(self, di):
+        stored = []
+
+        class RecordingScope(mainline.scope.ThreadScope):
+            def __setitem__(self, key, value):
+                stored.append((threading.current_thread(), key))
+                super(RecordingScope, self).__setitem__(key, value)
+
+        provider = di.provider(object, scope=RecordingScope)
+        instance = provider()
+        assert provider() is instance
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(provider()))
+        thread.start()
+        thread.join()
+
+        assert results[0] is not instance
+        assert stored == [(threading.current_thread(), ''), (thread, '')]
+
+    def test_catalog_subclass_get_used(self):
+        looked_up = []
+
+        class RecordingCatalog(mainline.Catalog):
+            def get(self, key, default=None):
+                looked_up.append(key)
+                return super(RecordingCatalog, self).get(key, default)
+
+        di = mainline.Di(providers_factory=RecordingCatalog)
+        di.register_factory('thing', object)
+        di.resolve('thing')
+        assert looked_up == ['thing']
+
+    def test_proxy_mapping_get_uses_getitem(self):
+        class Lower(mainline.utils.ProxyMutableMapping):
+            def __getitem__(self, key):
+                return super(Lower, self).__getitem__(key.lower())
+
+        mapping = Lower(dict(a=1))
+        assert mapping.get('A') == 1
+        assert mapping.get('B') is None
+
+    def test_global_scope_subclass_key_transform(self, di):
+        class PrefixedScope(mainline.scope.GlobalScope):
+            def __key_transform__(self, key):
+                return 'p_' + key
+
+        provider = di.provider(object, scope=PrefixedScope)
+        provider.key = 'x'
+        instance = provider()
+        assert provider() is instance
+        assert list(provider.scope.instances) == ['p_x']
+
+    @pytest.mark.parametrize('proxy, stored_key', [
+        (mainline.scope.ProxyScope, 'k'),
+        (functools.partial(mainline.scope.NamespacedProxyScope, 'ns'), 'ns__k'),
+    ])
+    def test_proxy_scope_over_process_scope(self, proxy, stored_key):
+        inner = mainline.scope.ProcessScope()
+        scope = proxy(inner)
+        scope['k'] = 'v'
+
+        # Keys arrive at the inner scope already handled by the proxy, so its own transform is not applied again
+        assert list(inner.instances) == [stored_key]
+        assert scope['k'] == 'v'
+        assert 'k' in scope
+
+    def test_provider_subclass_storage_hooks(self, di):
+        calls = []
+
+        class RecordingProvider(mainline.Provider):
+            def has_instance(self):
+                calls.append('has')
+                return super(RecordingProvider, self).has_instance()
+
+            def set_instance(self, instance):
+                calls.append('set')
+                super(RecordingProvider, self).set_instance(instance)
+
+        provider = RecordingProvider(object, scope='global')
+        instance = provider()
+        assert provider() is instance
+        assert provider.provide() is instance
+        assert calls == ['has', 'set', 'has', 'has']
+
+    def test_provider_weakref(self, di):
+        provider = di.provider(object)
+        assert weakref.ref(provider)() is provider
+
+    def test_provider_scope_reassigned(self, di):
+        provider = di.provider(object, scope='none')
+        assert provider() is not provider()
+
+        provider.scope = mainline.scope.GlobalScope()
+        assert provider() is provider()
+
+    @pytest.mark.parametrize('injector', ['inject', 'auto_inject'])
+    def test_inject_class_without_init(self, di, injector):
+        class NoInit(object):
+            pass
+
+        with pytest.raises(mainline.DiError):
+            getattr(di, injector)('k')(NoInit)
+
+    def test_none_scope_shared(self, di):
+        first = di.provider(object, scope='none')
+        second = di.provider(object, scope=mainline.scope.NoneScope)
+        assert first.scope is second.scope
+
+        assert first() is not first()
+
+        class StatefulNoneScope(mainline.scope.NoneScope):
+            pass
+
+        first = di.provider(object, scope=StatefulNoneScope)
+        second = di.provider(object, scope=StatefulNoneScope)
+        assert first.scope is not second.scope
+        assert di.provider(object, scope='global').scope is not di.provider(object, scope='global').scope
+
+    def test_resolve_singleton_replacement(self, di):
+        key = 'test_singleton_replacement'
+        di.register_factory(key, lambda: object(), scope='global')
+        instance = di.resolve(key)
+        assert di.resolve(key) is instance
+
+        replacement = object()
+        di.set_instance(key, replacement)
+        assert di.resolve(key) is replacement
+
+        other = object()
+        di.register_factory(key, lambda: other, scope='global', allow_overwrite=True)
+        assert di.resolve(key) is other
+
+        del di.providers[key]
+        with pytest.raises(mainline.UnresolvableError):
+            di.resolve(key)
+
+    def test_resolve_singleton_sees_outside_changes(self, di):
+        class TestCatalog(mainline.Catalog):
+            thing = mainline.Provider(object, scope='global')
+
+        other = mainline.Di()
+        di.update(TestCatalog)
+        other.update(TestCatalog)
+        di.resolve('thing')
+
+        # Providers are shared between everything updated from the same catalog
+        other.set_instance('thing', 'shared')
+        assert di.resolve('thing') == 'shared'
+
+        di.providers['thing'].set_instance('direct')
+        assert di.resolve('thing') == 'direct'
+
+        di.providers['thing'].scope.clear()
+        instance = di.resolve('thing')
+        assert instance not in ('shared', 'direct')
+
+        di.depends_on('test_missing_dep')('thing')
+        with pytest.raises(mainline.UnresolvableError):
+            di.resolve('thing')
+
+    def test_resolve_singleton_released_on_delete(self, di):
+        key = 'test_singleton_release'
+
+        class Thing(object):
+            pass
+
+        di.register_factory(key, Thing, scope='global')
+        ref = weakref.ref(di.resolve(key))
+
+        del di.providers[key]
+        gc.collect()
+        assert ref() is None
+
+    def test_inject_kwargs_preserves_argspec(self, di, provider_kv):
+        key, provider = provider_kv
+
+        @di.inject(injected=key)
+        def test(arg1, injected=None):
+            return arg1, injected
+
+        assert test('arg1') == ('arg1', provider.return_value)
+        assert test('arg1', injected='override') == ('arg1', 'override')
+        assert test.__name__ == 'test'
+        assert getargspec(test).args == ['arg1', 'injected']
+
+    def test_resolve_thread_scope_per_thread(self, di):
+        key = 'test_thread_scope_per_thread'
+        di.register_factory(key, object, scope='thread')
+        instance = di.resolve(key)
+        assert di.resolve(key) is instance
+
+        results = []
+
+        def target():
+            results.append(di.resolve(key))
+            results.append(di.resolve(key))
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+
+        assert results[0] is results[1]
+        assert results[0] is not instance
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+    def test_resolve_process_scope_after_fork(self, di):
+        key = 'test_process_scope_after_fork'
+        di.register_factory(key, object, scope='process')
+        instance = di.resolve(key)
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if not pid:
+            os.close(read_fd)
+            same = di.resolve(key) is instance
+            os.write(write_fd, b'same' if same else b'new')
+            os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd, 'rb') as f:
+            result = f.read()
+        os.waitpid(pid, 0)
+
+        assert result == b'new'
+        assert di.resolve(key) is instance
+
+    def test_auto_inject_renamed_repeated_calls(self, di, provider_kv):
+        key, provider = provider_kv
+
+        @di.auto_inject(renamed=key)
+        def test(arg1, renamed):
+            return arg1, renamed
+
+        for _ in range(2):
+            assert test('arg1') == ('arg1', provider.return_value)
+
+    def test_resolve_singleton_chain_builds_once(self, di):
+        calls = []
+
+        @di.register_factory('chain_qux', scope='global')
+        def qux():
+            calls.append('qux')
+            return 'qux'
+
+        @di.register_factory('chain_baz', scope='global')
+        @di.inject('chain_qux')
+        def baz(qux):
+            calls.append('baz')
+            return 'baz', qux
+
+        @di.register_factory('chain_bar', scope='global')
+        @di.inject('chain_baz')
+        def bar(baz):
+            calls.append('bar')
+            return 'bar', baz
+
+        first = di.resolve('chain_bar')
+        assert first == ('bar', ('baz', 'qux'))
+        assert di.resolve('chain_bar') is first
+        assert di.resolve('chain_baz') is first[1]
+        assert sorted(calls) == ['bar', 'baz', 'qux']
+
+    def test_inject_classproperty_replace_on_access(self, di):
+        key = 'test_classproperty_replace'
+        instance = object()
+        di.set_instance(key, instance)
+
+        @di.inject_classproperty(key, replace_on_access=True)
+        class Injectee(object):
+            pass
+
+        # The singleton was already built, so it's set as a plain attribute straight away
+        assert Injectee.__dict__[key] is instance
+
+        lazy_key = 'test_classproperty_replace_lazy'
+        di.register_factory(lazy_key, object, scope='global')
+
+        @di.inject_classproperty(lazy_key, replace_on_access=True)
+        class LazyInjectee(object):
+            pass
+
+        # Not built yet, so nothing is constructed until first access
+        assert not di.providers[lazy_key].has_instance()
+        lazy_instance = LazyInjectee.test_classproperty_replace_lazy
+        assert LazyInjectee.__dict__[lazy_key] is lazy_instance
+
+    def test_inject_class_init(self, di, provider_kv):
+        key, provider = provider_kv
+
+        @di.inject(key)
+        class Injectee(object):
+            def __init__(self, injected, arg1, kwarg1=None):
+                self.injected = injected
+                self.arg1 = arg1
+                self.kwarg1 = kwarg1
+
+        injectee = Injectee('arg1', kwarg1='kwarg1')
+        assert injectee.injected is provider.return_value
+        assert (injectee.arg1, injectee.kwarg1) == ('arg1', 'kwarg1')
+        assert getargspec(Injectee.__init__).args == ['self', 'arg1', 'kwarg1']